@@ -8119,7 +8119,7 @@ class MigrationStatusWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -8679,7 +8679,7 @@ class ModelSummaryWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -8875,7 +8875,7 @@ class NotifyWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -8980,7 +8980,7 @@ class OfferStatusWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -9421,7 +9421,7 @@ class RelationStatusWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -9523,7 +9523,7 @@ class RelationUnitsWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -9633,7 +9633,7 @@ class RemoteRelationWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -10820,7 +10820,7 @@ class SecretsRotationWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -10918,7 +10918,7 @@ class SecretsTriggerWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -11007,7 +11007,7 @@ class StringsWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -11701,7 +11701,7 @@ class VolumeAttachmentPlansWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
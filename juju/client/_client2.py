@@ -78,7 +78,7 @@ class AllWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -2684,7 +2684,7 @@ class EntityWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -2780,7 +2780,7 @@ class FilesystemAttachmentsWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -5420,7 +5420,7 @@ class VolumeAttachmentsWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
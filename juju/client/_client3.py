@@ -783,7 +783,7 @@ class AllModelWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -864,7 +864,7 @@ class AllWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -78,7 +78,7 @@ class AllModelWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
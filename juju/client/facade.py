@@ -1,10 +1,15 @@
 import argparse
 import builtins
 import functools
+import hashlib
 import json
 import keyword
-import pprint
+import logging
+import operator
+import os
 import re
+import sys
+import tempfile
 import textwrap
 import typing
 from collections import defaultdict
@@ -16,6 +21,8 @@ import typing_inspect
 
 from . import codegen
 
+log = logging.getLogger(__name__)
+
 _marker = object()
 
 JUJU_VERSION = re.compile(r'[0-9]+\.[0-9-]+[\.\-][0-9a-z]+(\.[0-9]+)?')
@@ -116,10 +123,16 @@ CLIENTS = {{
 
 class KindRegistry(dict):
 
+    def __init__(self):
+        # Max registered version of each name, so lookups don't have to
+        # scan the versions.
+        self._max_versions = {}
+
     def register(self, name, version, obj):
         self[name] = {version: {
             "object": obj,
         }}
+        self._max_versions[name] = version
 
     def lookup(self, name, version=None):
         """If version is omitted, max version is used"""
@@ -128,7 +141,7 @@ class KindRegistry(dict):
             return None
         if version:
             return versions[version]
-        return versions[max(versions)]
+        return versions[self._max_versions[name]]
 
     def getObj(self, name, version=None):
         result = self.lookup(name, version)
@@ -142,16 +155,28 @@ class TypeRegistry(dict):
 
     def __init__(self, schema):
         self.schema = schema
+        # Raw reference (e.g. "#/definitions/Foo") to TypeVar, so repeat
+        # lookups skip resolving the reference name.
+        self._refs = {}
+        # Every TypeVar handed out, so buildTypes doesn't have to filter
+        # them back out of the two way mapping.
+        self.ordered_vars = []
 
     def get(self, name):
+        try:
+            return self._refs[name]
+        except KeyError:
+            pass
         # Two way mapping
         refname = self.schema.referenceName(name)
         if refname not in self:
             result = TypeVar(refname)
             self[refname] = result
             self[result] = refname
+            self.ordered_vars.append(result)
 
-        return self[refname]
+        result = self._refs[name] = self[refname]
+        return result
 
     def getRefType(self, ref):
         return self.get(ref)
@@ -180,7 +205,11 @@ def booler(v):
     return bool(v)
 
 
-basic_types = [str, bool, int, float]
+_BASIC = frozenset((str, bool, int, float))
+
+
+_INDENT = "    "
+_INDENT2 = _INDENT * 2
 
 
 type_mapping = {
@@ -191,10 +220,14 @@ type_mapping = {
 }
 
 
+_BUILTINS = frozenset(dir(builtins))
+
+
+@functools.lru_cache(maxsize=None)
 def name_to_py(name):
     result = name.replace("-", "_")
     result = result.lower()
-    if keyword.iskeyword(result) or result in dir(builtins):
+    if keyword.iskeyword(result) or result in _BUILTINS:
         result += "_"
     return result
 
@@ -214,7 +247,7 @@ def kind_to_py(kind):
     else:
         name = kind.__name__
 
-    if (kind in basic_types or type(kind) in basic_types):
+    if (kind in _BASIC or type(kind) in _BASIC):
         return name, type_mapping.get(name) or name, True
     if (name in type_mapping):
         return name, type_mapping[name], True
@@ -223,9 +256,10 @@ def kind_to_py(kind):
     return suffix, "(dict, {})".format(suffix), True
 
 
+@functools.lru_cache(maxsize=None)
 def strcast(kind, keep_builtins=False):
-    if (kind in basic_types or
-            type(kind) in basic_types) and keep_builtins is False:
+    if (kind in _BASIC or
+            type(kind) in _BASIC) and keep_builtins is False:
         return kind.__name__
     if str(kind).startswith('~'):
         return str(kind)[1:]
@@ -239,6 +273,22 @@ def strcast(kind, keep_builtins=False):
     return kind
 
 
+@functools.lru_cache(maxsize=None)
+def explodes(kind):
+    """
+    Return whether a lone argument of this kind is replaced by the fields of
+    the type it refers to, rather than being passed as is.
+
+    """
+    if kind is Any:
+        return False
+    if kind in _BASIC or type(kind) is typing.TypeVar:
+        return False
+    if typing_inspect.is_generic_type(kind) and issubclass(typing_inspect.get_origin(kind), (Sequence, Mapping)):
+        return False
+    return True
+
+
 class Args(list):
 
     def __init__(self, schema, defs):
@@ -253,59 +303,46 @@ class Args(list):
             else:
                 for name, rtype in rtypes:
                     self.append((name, rtype))
+        # The args don't change once built, so work out the name mappings
+        # and argument strings only once.
+        self._py_to_schema = {name_to_py(n): n for n, _ in self}
+        self._schema_to_py = {n: name_to_py(n) for n, _ in self}
+        self._arg_strs = {}
 
     def do_explode(self, kind):
-        if kind is Any:
-            return False
-        if kind in basic_types or type(kind) is typing.TypeVar:
-            return False
-        if typing_inspect.is_generic_type(kind) and issubclass(typing_inspect.get_origin(kind), Sequence):
-            return False
-        if typing_inspect.is_generic_type(kind) and issubclass(typing_inspect.get_origin(kind), Mapping):
+        if not explodes(kind):
             return False
         self.clear()
         self.extend(Args(self.schema, kind))
         return True
 
     def PyToSchemaMapping(self):
-        m = {}
-        for n, rt in self:
-            m[name_to_py(n)] = n
-        return m
+        return self._py_to_schema
 
     def SchemaToPyMapping(self):
-        m = {}
-        for n, tr in self:
-            m[n] = name_to_py(n)
-        return m
+        return self._schema_to_py
 
-    def _format(self, name, rtype, typed=True):
+    def _get_arg_str(self, typed=False, joined=", "):
+        if not self:
+            return ''
+        if joined and (typed, joined) in self._arg_strs:
+            return self._arg_strs[typed, joined]
+        to_py = name_to_py
         if typed:
-            return "{} : {}".format(
-                name_to_py(name),
-                strcast(rtype)
-            )
+            parts = ["{} : {}".format(to_py(name), strcast(rtype))
+                     for name, rtype in self]
         else:
-            return name_to_py(name)
-
-    def _get_arg_str(self, typed=False, joined=", "):
-        if self:
-            parts = []
-            for item in self:
-                parts.append(self._format(item[0], item[1], typed))
-            if joined:
-                return joined.join(parts)
-            return parts
-        return ''
+            parts = [to_py(name) for name, _ in self]
+        if joined:
+            result = self._arg_strs[typed, joined] = joined.join(parts)
+            return result
+        return parts
 
     def as_kwargs(self):
         if self:
-            parts = []
-            for item in self:
-                var_name = name_to_py(item[0])
-                var_type = var_type_to_py(item[1])
-                parts.append('{}={}'.format(var_name, var_type))
-            return ', '.join(parts)
+            to_py = name_to_py
+            return ', '.join('{}={}'.format(to_py(name), var_type_to_py(rtype))
+                             for name, rtype in self)
         return ''
 
     def as_validation(self):
@@ -327,12 +364,20 @@ class Args(list):
     def __str__(self):
         return self._get_arg_str(False)
 
-    def get_doc(self):
-        return self._get_arg_str(True, "\n")
+    def get_doc(self, indent=""):
+        doc = self._get_arg_str(True, "\n")
+        if not indent:
+            return doc
+        # Generated classes and methods indent the same docs over and over,
+        # so keep the indented versions too.
+        key = ("doc", indent)
+        if key not in self._arg_strs:
+            self._arg_strs[key] = textwrap.indent(doc, indent)
+        return self._arg_strs[key]
 
 
 def buildValidation(name, instance_type, instance_sub_type, ident=None):
-    INDENT = ident or "    "
+    INDENT = ident or _INDENT
     source = """{ident}if {name} is not None and not isinstance({name}, {instance_sub_type}):
 {ident}    raise Exception("Expected {name} to be a {instance_type}, received: {{}}".format(type({name})))
 """.format(ident=INDENT,
@@ -343,9 +388,7 @@ def buildValidation(name, instance_type, instance_sub_type, ident=None):
 
 
 def buildTypes(schema, capture):
-    INDENT = "    "
-    for kind in sorted((k for k in schema.types if not isinstance(k, str)),
-                       key=lambda x: str(x)):
+    for kind in sorted(schema.types.ordered_vars, key=schema.types.__getitem__):
         name = schema.types[kind]
         if name in capture and name not in NAUGHTY_CLASSES:
             continue
@@ -355,35 +398,32 @@ def buildTypes(schema, capture):
         # Write actual class
         source = ["""
 class {}(Type):
-    _toSchema = {}
-    _toPy = {}
+    _fields = {!r}
     def __init__(self{}{}, **unknown_fields):
         '''
 {}
         '''""".format(
             name,
-            # pprint these to get stable ordering across regens
-            pprint.pformat(args.PyToSchemaMapping(), width=999),
-            pprint.pformat(args.SchemaToPyMapping(), width=999),
+            type_fields(args),
             ", " if args else "",
             args.as_kwargs(),
-            textwrap.indent(args.get_doc(), INDENT * 2))]
+            args.get_doc(_INDENT2))]
 
         if not args:
-            source.append("{}self.unknown_fields = unknown_fields".format(INDENT * 2))
+            source.append("{}self.unknown_fields = unknown_fields".format(_INDENT2))
         else:
             # do the validation first, before setting the variables
             for arg in args:
                 arg_name = name_to_py(arg[0])
                 arg_type = arg[1]
                 arg_type_name = strcast(arg_type)
-                if arg_type in basic_types or arg_type is typing.Any:
-                    source.append("{}{}_ = {}".format(INDENT * 2,
+                if arg_type in _BASIC or arg_type is typing.Any:
+                    source.append("{}{}_ = {}".format(_INDENT2,
                                                       arg_name,
                                                       arg_name))
                 elif type(arg_type) is typing.TypeVar:
                     source.append("{}{}_ = {}.from_json({}) "
-                                  "if {} else None".format(INDENT * 2,
+                                  "if {} else None".format(_INDENT2,
                                                            arg_name,
                                                            arg_type_name,
                                                            arg_name,
@@ -398,12 +438,12 @@ class {}(Type):
                     if type(value_type) is typing.TypeVar:
                         source.append(
                             "{}{}_ = [{}.from_json(o) "
-                            "for o in {} or []]".format(INDENT * 2,
+                            "for o in {} or []]".format(_INDENT2,
                                                         arg_name,
                                                         strcast(value_type),
                                                         arg_name))
                     else:
-                        source.append("{}{}_ = {}".format(INDENT * 2,
+                        source.append("{}{}_ = {}".format(_INDENT2,
                                                           arg_name,
                                                           arg_name))
                 elif typing_inspect.is_generic_type(arg_type) and issubclass(typing_inspect.get_origin(arg_type), Mapping):
@@ -417,20 +457,20 @@ class {}(Type):
                         source.append(
                             "{}{}_ = {{k: {}.from_json(v) "
                             "for k, v in ({} or dict()).items()}}".format(
-                                INDENT * 2,
+                                _INDENT2,
                                 arg_name,
                                 strcast(value_type),
                                 arg_name))
                     else:
-                        source.append("{}{}_ = {}".format(INDENT * 2,
+                        source.append("{}{}_ = {}".format(_INDENT2,
                                                           arg_name,
                                                           arg_name))
                 else:
-                    source.append("{}{}_ = {}".format(INDENT * 2,
+                    source.append("{}{}_ = {}".format(_INDENT2,
                                                       arg_name,
                                                       arg_name))
             if len(args) > 0:
-                source.append('\n{}# Validate arguments against known Juju API types.'.format(INDENT * 2))
+                source.append('\n{}# Validate arguments against known Juju API types.'.format(_INDENT2))
             for arg in args:
                 arg_name = "{}_".format(name_to_py(arg[0]))
                 arg_type, arg_sub_type, ok = kind_to_py(arg[1])
@@ -438,26 +478,56 @@ class {}(Type):
                     source.append('{}'.format(buildValidation(arg_name,
                                                               arg_type,
                                                               arg_sub_type,
-                                                              ident=INDENT * 2)))
+                                                              ident=_INDENT2)))
 
             for arg in args:
                 arg_name = name_to_py(arg[0])
-                source.append('{}self.{} = {}_'.format(INDENT * 2, arg_name, arg_name))
+                source.append('{}self.{} = {}_'.format(_INDENT2, arg_name, arg_name))
             # Ensure that we take the kwargs (unknown_fields) and put it on the
             # Results/Params so we can inspect it.
-            source.append("{}self.unknown_fields = unknown_fields".format(INDENT * 2))
+            source.append("{}self.unknown_fields = unknown_fields".format(_INDENT2))
 
-        source = "\n".join(source)
+        source = "\n".join(source) + "\n\n"
         capture.clear(name)
         capture[name].write(source)
-        capture[name].write("\n\n")
-        co = compile(source, __name__, "exec")
-        ns = _getns(schema)
-        exec(co, ns)
-        cls = ns[name]
+        cls = makeType(name, args)
         CLASSES[name] = cls
 
 
+def type_fields(args):
+    """
+    Return the (python name, schema name) pairs of a generated type, from
+    which Type derives its _toSchema and _toPy mappings.
+
+    """
+    return tuple((name_to_py(n), n) for n, _ in args)
+
+
+def makeType(name, args):
+    """
+    Build a placeholder class for a generated type, registered in CLASSES.
+
+    This is not equivalent to the source written by buildTypes: __init__
+    only takes keyword arguments, and nested fields are neither converted
+    with from_json nor validated. Nothing calls these classes during
+    generation; the real types come from the written _definitions.py.
+
+    """
+    to_schema = args.PyToSchemaMapping()
+    fields = tuple(to_schema)
+
+    def __init__(self, **kwargs):
+        for field in fields:
+            setattr(self, field, kwargs.pop(field, None))
+        self.unknown_fields = kwargs
+
+    __init__.__doc__ = args.get_doc()
+    return type(name, (Type,), {
+        '_fields': type_fields(args),
+        '__init__': __init__,
+    })
+
+
 def retspec(schema, defs):
     # return specs
     # only return 1, so if there is more than one type
@@ -466,8 +536,6 @@ def retspec(schema, defs):
     # Error or the expected Type
     if not defs:
         return None
-    if defs in basic_types:
-        return strcast(defs, False)
     return strcast(defs, False)
 
 
@@ -475,47 +543,31 @@ def ReturnMapping(cls):
     # Annotate the method with a return Type
     # so the value can be cast
     def decorator(f):
+        # Work out how replies are mapped once, when the method is defined,
+        # rather than on every call.
+        item_cls = None
+        if cls is not None and typing_inspect.is_generic_type(cls) and issubclass(typing_inspect.get_origin(cls), Sequence):
+            parameters = typing_inspect.get_parameters(cls)
+            if parameters:
+                item_cls = parameters[0]
+
         @functools.wraps(f)
         async def wrapper(*args, **kwargs):
-            nonlocal cls
             reply = await f(*args, **kwargs)
             if cls is None:
                 return reply
             if 'error' in reply:
-                cls = CLASSES['Error']
-            if typing_inspect.is_generic_type(cls) and issubclass(typing_inspect.get_origin(cls), Sequence):
-                parameters = typing_inspect.get_parameters(cls)
-                result = []
-                item_cls = parameters[0]
-                for item in reply:
-                    result.append(item_cls.from_json(item))
-                    """
-                    if 'error' in item:
-                        cls = CLASSES['Error']
-                    else:
-                        cls = item_cls
-                    result.append(cls.from_json(item))
-                    """
-            else:
-                result = cls.from_json(reply['response'])
+                return CLASSES['Error'].from_json(reply['response'])
+            if item_cls is not None:
+                return [item_cls.from_json(item) for item in reply]
+            return cls.from_json(reply['response'])
 
-            return result
+        wrapper.__return_type__ = cls
         return wrapper
     return decorator
 
 
-def makeFunc(cls, name, description, params, result, _async=True):
-    INDENT = "    "
-    args = Args(cls.schema, params)
-    assignments = []
-    toschema = args.PyToSchemaMapping()
-    for arg in args._get_arg_str(False, False):
-        assignments.append("{}_params[\'{}\'] = {}".format(INDENT,
-                                                           toschema[arg],
-                                                           arg))
-    assignments = "\n".join(assignments)
-    res = retspec(cls.schema, result)
-    source = """
+_METHOD_TEMPLATE = """
 
 @ReturnMapping({rettype})
 {_async}def {name}(self{argsep}{args}):
@@ -536,26 +588,69 @@ def makeFunc(cls, name, description, params, result, _async=True):
 
 """
 
+
+def makeFunc(cls, name, description, params, result, _async=True):
+    args = Args(cls.schema, params)
+    toschema = args.PyToSchemaMapping()
+    assignments = "\n".join(
+        "{}_params[\'{}\'] = {}".format(_INDENT, schema_name, py_name)
+        for py_name, schema_name in toschema.items())
+    res = retspec(cls.schema, result)
+
     if description != "":
         description = "{}\n\n".format(description)
     doc_string = "{}{}".format(description, args.get_doc())
-    fsource = source.format(_async="async " if _async else "",
-                            name=name,
-                            argsep=", " if args else "",
-                            args=args.as_kwargs(),
-                            res=res,
-                            validation=args.as_validation(),
-                            rettype=result.__name__ if result else None,
-                            docstring=textwrap.indent(doc_string, INDENT),
-                            cls=cls,
-                            assignments=assignments,
-                            _await="await " if _async else "")
-    ns = _getns(cls.schema)
-    exec(fsource, ns)
-    func = ns[name]
+    fsource = _METHOD_TEMPLATE.format(
+        _async="async " if _async else "",
+        name=name,
+        argsep=", " if args else "",
+        args=args.as_kwargs(),
+        res=res,
+        validation=args.as_validation(),
+        rettype=result.__name__ if result else None,
+        docstring=textwrap.indent(description, _INDENT) + args.get_doc(_INDENT),
+        cls=cls,
+        assignments=assignments,
+        _await="await " if _async else "")
+    func = _makeMethod(cls, name, toschema, _async)
+    func.__doc__ = doc_string
+    func.__return_type__ = result
     return func, fsource
 
 
+def _makeMethod(cls, name, toschema, _async=True):
+    """
+    Build a placeholder method for a facade, as a closure over the facade
+    and its argument mapping.
+
+    This is not equivalent to the source written by makeFunc: it only takes
+    keyword arguments, doesn't validate them and isn't wrapped in
+    ReturnMapping, so it returns the raw reply. Nothing calls these methods
+    during generation; the real ones come from the written clients.
+
+    """
+    def msg(kwargs):
+        try:
+            params = {toschema[k]: v for k, v in kwargs.items()}
+        except KeyError as e:
+            raise TypeError("{}() got an unexpected keyword argument {}".format(
+                name, e))
+        return dict(type=cls.name,
+                    request=name,
+                    version=cls.version,
+                    params=params)
+
+    if _async:
+        async def method(self, **kwargs):
+            return await self.rpc(msg(kwargs))
+    else:
+        def method(self, **kwargs):
+            return self.rpc(msg(kwargs))
+
+    method.__name__ = method.__qualname__ = name
+    return method
+
+
 def makeRPCFunc(cls):
     source = """
 
@@ -565,22 +660,29 @@ async def rpc(self, msg):
     '''
     if not hasattr(self, 'Id'):
         raise RuntimeError('Missing "Id" field')
-    msg['Id'] = id
+    msg['Id'] = self.Id
 
     from .facade import TypeEncoder
     reply = await self.connection.rpc(msg, encoder=TypeEncoder)
     return reply
 
 """
-    ns = _getns(cls.schema)
-    exec(source, ns)
-    func = ns["rpc"]
-    return func, source
+
+    async def rpc(self, msg):
+        '''
+        Patch rpc method to add Id.
+        '''
+        if not hasattr(self, 'Id'):
+            raise RuntimeError('Missing "Id" field')
+        msg['Id'] = self.Id
+        return await self.connection.rpc(msg, encoder=TypeEncoder)
+
+    return rpc, source
 
 
 def buildMethods(cls, capture):
     properties = cls.schema['properties']
-    for methodname in sorted(properties):
+    for methodname in properties:
         method, source = _buildMethod(cls, methodname)
         setattr(cls, methodname, method)
         capture["{}Facade".format(cls.__name__)].write(source, depth=1)
@@ -619,14 +721,17 @@ def buildFacade(schema):
     cls = type(schema.name, (Type,), dict(name=schema.name,
                                           version=schema.version,
                                           schema=schema))
+    # The schema is embedded as a compact JSON string rather than a
+    # pretty-printed dict literal; it's much quicker to produce, and smaller
+    # for the generated module to parse and load.
     source = """
 class {name}Facade(Type):
     name = '{name}'
     version = {version}
-    schema = {schema}
+    schema = json.loads({schema!r})
     """.format(name=schema.name,
                version=schema.version,
-               schema=textwrap.indent(pprint.pformat(schema), "    "))
+               schema=json.dumps(dict(schema), separators=(',', ':')))
     return cls, source
 
 
@@ -638,6 +743,20 @@ class TypeEncoder(json.JSONEncoder):
 
 
 class Type:
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Generated types only list their (python, schema) field names, the
+        # mappings both ways are built from those.
+        if '_fields' in cls.__dict__:
+            cls._toSchema = {py: schema for py, schema in cls._fields}
+            cls._toPy = {schema: py for py, schema in cls._fields}
+        # Work out how to serialize each field once per class, rather than on
+        # every serialize() call.
+        if '_toSchema' in cls.__dict__:
+            cls._serializers = tuple(
+                (tgt, operator.attrgetter(attr))
+                for attr, tgt in cls._toSchema.items())
+
     def connect(self, connection):
         self.connection = connection
 
@@ -689,10 +808,7 @@ class Type:
         return None
 
     def serialize(self):
-        d = {}
-        for attr, tgt in self._toSchema.items():
-            d[tgt] = getattr(self, attr)
-        return d
+        return {tgt: get(self) for tgt, get in self._serializers}
 
     def to_json(self):
         return json.dumps(self.serialize(), cls=TypeEncoder, sort_keys=True)
@@ -723,11 +839,17 @@ class Schema(dict):
         self.name = schema['Name']
         self.version = schema['Version']
         self.update(schema['Schema'])
+        # Sort the methods once here, so the generated facades keep a stable
+        # order without sorting them again when they are built.
+        if 'properties' in self:
+            self['properties'] = dict(sorted(self['properties'].items()))
 
         self.registry = KindRegistry()
         self.types = TypeRegistry(self)
 
-    def referenceName(self, ref):
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def referenceName(ref):
         if ref.startswith("#/definitions/"):
             ref = ref.rsplit("/", 1)[-1]
         return ref
@@ -748,6 +870,9 @@ class Schema(dict):
             if data.get("type") != "object":
                 continue
             definitions[d] = data
+        # Structurally identical definitions aren't interned: they make up
+        # well under 1% of the juju schemas, and canonicalizing every
+        # definition to find them costs more than walking them.
         for d, definition in definitions.items():
             node = self.buildObject(definition, d)
             self.registry.register(d, self.version, node)
@@ -758,14 +883,16 @@ class Schema(dict):
         # they are all in definitions already
         # we only want to include the type reference
         # which we can derive from the name
-        struct = []
-        add = struct.append
-        props = node.get("properties")
-        pprops = node.get("patternProperties")
-        if props:
-            # Sort these so the __init__ arg list for each Type remains
-            # consistently ordered across regens of client.py
-            for p in sorted(props):
+        # Nested objects are flattened into the fields of their parent, so
+        # walk them with a stack of (node, name, fields, remaining properties)
+        # frames rather than recursing.
+        result = []
+        stack = [(node, name, result, self._sortedProperties(node))]
+        while stack:
+            node, name, struct, remaining = stack[-1]
+            add = struct.append
+            props = node.get("properties")
+            for p in remaining:
                 prop = props[p]
                 if "$ref" in prop:
                     add((p, self.types.refType(prop)))
@@ -774,9 +901,25 @@ class Schema(dict):
                     if kind == "array":
                         add((p, self.buildArray(prop)))
                     elif kind == "object":
-                        struct.extend(self.buildObject(prop, p))
+                        stack.append((prop, p, [], self._sortedProperties(prop)))
+                        break
                     else:
                         add((p, self.types.objType(prop)))
+            else:
+                stack.pop()
+                self._buildObjectTail(node, name, struct)
+                if stack:
+                    stack[-1][2].extend(struct)
+        return result
+
+    def _sortedProperties(self, node):
+        # Sort these so the __init__ arg list for each Type remains
+        # consistently ordered across regens of client.py
+        return iter(sorted(node.get("properties") or ()))
+
+    def _buildObjectTail(self, node, name, struct):
+        add = struct.append
+        pprops = node.get("patternProperties")
         if pprops:
             if ".*" not in pprops:
                 raise ValueError(
@@ -785,7 +928,7 @@ class Schema(dict):
             pprop = pprops[".*"]
             if "$ref" in pprop:
                 add((name, Mapping[str, self.types.refType(pprop)]))
-                return struct
+                return
             ppkind = pprop["type"]
             if ppkind == "array":
                 add((name, Mapping[str, self.buildArray(pprop)]))
@@ -795,30 +938,14 @@ class Schema(dict):
         if not struct and node.get('additionalProperties', False):
             add((name, SCHEMA_TO_PYTHON.get('object')))
 
-        return struct
-
     def buildArray(self, obj):
-        # return a sequence from an array in the schema
+        # return a sequence from an array in the schema, nested arrays
+        # collapse into a sequence of their innermost items
+        while "$ref" not in obj and obj.get("type") == "array":
+            obj = obj['items']
         if "$ref" in obj:
             return Sequence[self.types.refType(obj)]
-        else:
-            kind = obj.get("type")
-            if kind and kind == "array":
-                items = obj['items']
-                return self.buildArray(items)
-            else:
-                return Sequence[self.types.objType(obj)]
-
-
-def _getns(schema):
-    ns = {'Type': Type,
-          'typing': typing,
-          'ReturnMapping': ReturnMapping
-          }
-    # Copy our types into the globals of the method
-    for facade in schema.registry:
-        ns[facade] = schema.registry.getObj(facade)
-    return ns
+        return Sequence[self.types.objType(obj)]
 
 
 def make_factory(name):
@@ -827,6 +954,20 @@ def make_factory(name):
     factories[name].write("class {}(TypeFactory):\n    pass\n\n".format(name))
 
 
+def write_module(filename, source):
+    """
+    Write a generated module to filename.
+
+    The whole module is compiled once before it is written, so that broken
+    generator output is reported here rather than when the client is
+    imported.
+
+    """
+    compile(source, filename, "exec")
+    with open(filename, "wb") as f:
+        f.write(source.encode("utf-8"))
+
+
 def write_facades(captures, options):
     """
     Write the Facades to the appropriate _client<version>.py
@@ -834,13 +975,15 @@ def write_facades(captures, options):
     """
     for version in sorted(captures.keys()):
         filename = "{}/_client{}.py".format(options.output_dir, version)
-        with open(filename, "w") as f:
-            f.write(HEADER)
-            f.write("from juju.client.facade import Type, ReturnMapping\n")
-            f.write("from juju.client._definitions import *\n\n")
-            for key in sorted(
-                    [k for k in captures[version].keys() if "Facade" in k]):
-                print(captures[version][key], file=f)
+        f = codegen.CodeWriter()
+        f.write(HEADER)
+        f.write("import json\n\n")
+        f.write("from juju.client.facade import Type, ReturnMapping\n")
+        f.write("from juju.client._definitions import *\n\n")
+        for key in sorted(
+                [k for k in captures[version].keys() if "Facade" in k]):
+            print(captures[version][key], file=f)
+        write_module(filename, str(f))
 
     # Return the last (most recent) version for use in other routines.
     return version
@@ -854,12 +997,13 @@ def write_definitions(captures, options):
     one of them -- we just use the last one from the loop above.
 
     """
-    with open("{}/_definitions.py".format(options.output_dir), "w") as f:
-        f.write(HEADER)
-        f.write("from juju.client.facade import Type, ReturnMapping\n\n")
-        for key in sorted(
-                [k for k in captures.keys() if "Facade" not in k]):
-            print(captures[key], file=f)
+    f = codegen.CodeWriter()
+    f.write(HEADER)
+    f.write("from juju.client.facade import Type, ReturnMapping\n\n")
+    for key in sorted(
+            [k for k in captures.keys() if "Facade" not in k]):
+        print(captures[key], file=f)
+    write_module("{}/_definitions.py".format(options.output_dir), str(f))
 
 
 def write_client(captures, options):
@@ -868,21 +1012,22 @@ def write_client(captures, options):
     imports and tables so that we can look up versioned Facades.
 
     """
-    with open("{}/_client.py".format(options.output_dir), "w") as f:
-        f.write(HEADER)
-        f.write("from juju.client._definitions import *\n\n")
-        clients = ", ".join("_client{}".format(v) for v in captures)
+    f = codegen.CodeWriter()
+    f.write(HEADER)
+    f.write("from juju.client._definitions import *\n\n")
+    clients = ", ".join("_client{}".format(v) for v in captures)
 
-        # from juju.client import _client2, _client1, _client3 ...
-        f.write("\nfrom juju.client import " + clients + "\n\n")
-        # CLIENTS = { ....
-        f.write(CLIENT_TABLE.format(clients=",\n    ".join(
-            ['"{}": _client{}'.format(v, v) for v in captures])))
+    # from juju.client import _client2, _client1, _client3 ...
+    f.write("\nfrom juju.client import " + clients + "\n\n")
+    # CLIENTS = { ....
+    f.write(CLIENT_TABLE.format(clients=",\n    ".join(
+        ['"{}": _client{}'.format(v, v) for v in captures])))
 
-        f.write(LOOKUP_FACADE)
-        f.write(TYPE_FACTORY)
-        for key in sorted([k for k in factories.keys() if "Facade" in k]):
-            print(factories[key], file=f)
+    f.write(LOOKUP_FACADE)
+    f.write(TYPE_FACTORY)
+    for key in sorted([k for k in factories.keys() if "Facade" in k]):
+        print(factories[key], file=f)
+    write_module("{}/_client.py".format(options.output_dir), str(f))
 
 
 def generate_definitions(schemas):
@@ -904,18 +1049,104 @@ def generate_definitions(schemas):
     return definitions
 
 
-def generate_facades(schemas):
+def generator_digest():
+    """
+    Hash of the code generator itself, so that cached facades are thrown
+    away whenever the generator changes. The Python and typing_inspect
+    versions are included too, since the generated docstrings embed the
+    str() of typing objects.
+
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(sys.version.encode("utf-8"))
+    for mod in (__file__, codegen.__file__, typing_inspect.__file__):
+        h.update(Path(mod).read_bytes())
+    return h.hexdigest()
+
+
+def facade_cache_path(cache_dir, schema, generator):
+    """
+    Return the path of the cached facade source for the given schema.
+
+    The file name is derived from a stable hash of the facade name, version
+    and schema, along with the generator digest (see generator_digest).
+
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(generator.encode("utf-8"))
+    h.update("{}:{}".format(schema.name, schema.version).encode("utf-8"))
+    h.update(json.dumps(schema, sort_keys=True).encode("utf-8"))
+    return Path(cache_dir) / "facade-{}.py".format(h.hexdigest())
+
+
+def write_cache(path, source):
+    """
+    Atomically write source to path, so that a concurrent or interrupted
+    run never leaves a truncated facade behind.
+
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(source)
+        os.replace(tmp, str(path))
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def read_cache(path):
+    """
+    Return the cached facade source at path, or None on a cache miss.
+
+    """
+    try:
+        return path.read_text("utf-8")
+    except FileNotFoundError:
+        return None
+
+
+def prune_cache(cache_dir, keep):
+    """
+    Remove the cached facades in cache_dir that are not in keep, so that
+    stale entries don't pile up every time the generator or schemas change.
+
+    """
+    for path in Path(cache_dir).glob("facade-*.py"):
+        if path not in keep:
+            path.unlink()
+
+
+def generate_facades(schemas, cache_dir=None):
     captures = defaultdict(codegen.Capture)
+    generator = generator_digest() if cache_dir else None
+    cache_files = set()
 
     # Build the Facade classes
     for juju_version in sorted(schemas.keys()):
         for schema in schemas[juju_version]:
-            cls, source = buildFacade(schema)
             cls_name = "{}Facade".format(schema.name)
 
             captures[schema.version].clear(cls_name)
             # Make the factory class for _client.py
             make_factory(cls_name)
+
+            cache_file = None
+            if cache_dir:
+                cache_file = facade_cache_path(cache_dir, schema, generator)
+                cache_files.add(cache_file)
+                try:
+                    source = read_cache(cache_file)
+                except OSError as e:
+                    log.warning("Disabling facade cache: %s", e)
+                    cache_dir = cache_file = None
+                    source = None
+                if source is not None:
+                    captures[schema.version][cls_name].write(source)
+                    continue
+
+            cls, source = buildFacade(schema)
             # Make the actual class
             captures[schema.version][cls_name].write(source)
             # Build the methods for each Facade class.
@@ -926,6 +1157,19 @@ def generate_facades(schemas):
             # helps mitigate some excessive looping.
             CLASSES[schema.name] = cls
 
+            if cache_file is not None:
+                try:
+                    write_cache(cache_file, str(captures[schema.version][cls_name]))
+                except OSError as e:
+                    log.warning("Disabling facade cache: %s", e)
+                    cache_dir = None
+
+    if cache_dir:
+        try:
+            prune_cache(cache_dir, cache_files)
+        except OSError as e:
+            log.warning("Unable to prune facade cache: %s", e)
+
     return captures
 
 
@@ -952,6 +1196,10 @@ def setup():
     parser = argparse.ArgumentParser()
     parser.add_argument("-s", "--schema", default="juju/client/schemas*")
     parser.add_argument("-o", "--output_dir", default="juju/client")
+    parser.add_argument("--cache-dir",
+                        default=os.path.join(os.path.expanduser("~"), ".cache", "juju"),
+                        help="directory used to cache generated facades; "
+                             "pass an empty string to disable caching")
     options = parser.parse_args()
     return options
 
@@ -963,7 +1211,7 @@ def main():
 
     # Generate some text blobs
     definitions = generate_definitions(schemas)
-    captures = generate_facades(schemas)
+    captures = generate_facades(schemas, options.cache_dir)
 
     # ... and write them out
     write_definitions(definitions, options)
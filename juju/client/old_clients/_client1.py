@@ -245,7 +245,7 @@ class AllWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -343,7 +343,7 @@ class ApplicationRelationsWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -12280,7 +12280,7 @@ class MigrationStatusWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -13224,7 +13224,7 @@ class ModelSummaryWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -13420,7 +13420,7 @@ class NotifyWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -13525,7 +13525,7 @@ class OfferStatusWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -14153,7 +14153,7 @@ class RelationStatusWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -14255,7 +14255,7 @@ class RelationUnitsWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -14370,7 +14370,7 @@ class RemoteApplicationWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -14480,7 +14480,7 @@ class RemoteRelationWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -15199,7 +15199,7 @@ class RemoteRelationsWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -16086,7 +16086,7 @@ class SecretsRotationWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -16270,7 +16270,7 @@ class StringsWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -17681,7 +17681,7 @@ class VolumeAttachmentPlansWatcherFacade(Type):
         '''
         if not hasattr(self, 'Id'):
             raise RuntimeError('Missing "Id" field')
-        msg['Id'] = id
+        msg['Id'] = self.Id
 
         from .facade import TypeEncoder
         reply = await self.connection.rpc(msg, encoder=TypeEncoder)
@@ -0,0 +1,252 @@
+"""
+Tests for the facade code generator and the Type base class
+
+"""
+
+import math
+
+import pytest
+
+from juju.client import codegen, facade
+
+
+class Tagged(facade.Type):
+    _toSchema = {'tag': 'tag'}
+    _toPy = {'tag': 'tag'}
+
+    def __init__(self, tag=None, **unknown_fields):
+        self.tag = tag
+        self.unknown_fields = unknown_fields
+
+
+def test_generated_type_accepts_extra_attributes():
+    # The library sets attributes the schemas don't declare on generated
+    # types (e.g. series on AddMachineParams), so they must stay open.
+    schema = facade.Schema({'Name': 'Test', 'Version': 1, 'Schema': {
+        'definitions': {'TestParams': {
+            'type': 'object',
+            'properties': {'tag': {'type': 'string'}},
+        }},
+    }})
+    schema.buildDefinitions()
+    capture = codegen.Capture()
+    facade.buildTypes(schema, capture)
+    ns = {}
+    exec("from juju.client.facade import Type\n" + str(capture['TestParams']), ns)
+
+    params = ns['TestParams'](tag='a')
+    params.series = 'jammy'
+    assert params.series == 'jammy'
+    assert params.serialize() == {'tag': 'a'}
+
+
+def test_serialize():
+    assert Tagged(tag='a').serialize() == {'tag': 'a'}
+    assert Tagged().serialize() == {'tag': None}
+
+
+def test_fields_mappings():
+    class Fields(facade.Type):
+        _fields = (('application_tag', 'application-tag'), ('id_', 'id'))
+
+    assert Fields._toSchema == {'application_tag': 'application-tag',
+                                'id_': 'id'}
+    assert Fields._toPy == {'application-tag': 'application_tag',
+                            'id': 'id_'}
+    obj = Fields()
+    obj.application_tag, obj.id_ = 'application-foo', 1
+    assert obj.serialize() == {'application-tag': 'application-foo', 'id': 1}
+    assert obj['id'] == 1
+
+
+@pytest.mark.asyncio
+async def test_return_mapping():
+    @facade.ReturnMapping(Tagged)
+    async def call(reply):
+        return reply
+
+    assert call.__return_type__ is Tagged
+    result = await call({'response': {'tag': 'a'}})
+    assert result == Tagged(tag='a')
+    result = await call({'response': {'tag': 'b'}})
+    assert result == Tagged(tag='b')
+
+
+def test_from_json_string():
+    assert Tagged.from_json('{"tag": "a"}') == Tagged(tag='a')
+    # stdlib json semantics: NaN is accepted and big ints stay ints
+    assert Tagged.from_json('{"tag": 18446744073709551617}').tag == 2 ** 64 + 1
+    assert math.isnan(Tagged.from_json('{"tag": NaN}').tag)
+
+
+class FakeError(facade.Type):
+    _toSchema = {'message': 'message'}
+    _toPy = {'message': 'message'}
+
+    def __init__(self, message=None, **unknown_fields):
+        self.message = message
+        self.unknown_fields = unknown_fields
+
+
+@pytest.mark.asyncio
+async def test_return_mapping_error_does_not_stick(monkeypatch):
+    monkeypatch.setitem(facade.CLASSES, 'Error', FakeError)
+
+    @facade.ReturnMapping(Tagged)
+    async def call(reply):
+        return reply
+
+    result = await call({'error': 'boom', 'response': {'message': 'boom'}})
+    assert isinstance(result, FakeError)
+    result = await call({'response': {'tag': 'a'}})
+    assert isinstance(result, Tagged)
+    assert result == Tagged(tag='a')
+
+
+def make_schema(version=1, methods=('Ping',)):
+    return facade.Schema({'Name': 'Test', 'Version': version, 'Schema': {
+        'type': 'object',
+        'properties': {m: {'type': 'object'} for m in methods},
+    }})
+
+
+def test_facade_cache_path(tmp_path):
+    path = facade.facade_cache_path(tmp_path, make_schema(), 'gen')
+    assert path.parent == tmp_path
+    assert path == facade.facade_cache_path(tmp_path, make_schema(), 'gen')
+    # any change to the schema, its version or the generator invalidates it
+    assert path != facade.facade_cache_path(
+        tmp_path, make_schema(methods=('Ping', 'Pong')), 'gen')
+    assert path != facade.facade_cache_path(tmp_path, make_schema(2), 'gen')
+    assert path != facade.facade_cache_path(tmp_path, make_schema(), 'gen2')
+
+
+def test_write_cache(tmp_path):
+    path = tmp_path / 'cache' / 'facade-x.py'
+    facade.write_cache(path, 'old')
+    facade.write_cache(path, 'new')
+    assert path.read_text() == 'new'
+    assert [p.name for p in path.parent.iterdir()] == ['facade-x.py']
+
+
+def test_write_cache_failure(tmp_path, monkeypatch):
+    path = tmp_path / 'facade-x.py'
+    facade.write_cache(path, 'old')
+
+    def fail(src, dst):
+        raise OSError('boom')
+
+    monkeypatch.setattr(facade.os, 'replace', fail)
+    with pytest.raises(OSError):
+        facade.write_cache(path, 'new')
+    assert path.read_text() == 'old'
+    assert [p.name for p in tmp_path.iterdir()] == ['facade-x.py']
+
+
+def test_generate_facades_cache(tmp_path, monkeypatch):
+    schema = make_schema()
+    captures = facade.generate_facades({'latest': [schema]}, str(tmp_path))
+    source = str(captures[1]['TestFacade'])
+    assert 'async def Ping(self)' in source
+
+    cache_file = facade.facade_cache_path(
+        tmp_path, schema, facade.generator_digest())
+    assert cache_file.read_text() == source
+
+    # a cache hit uses the cached source without building the facade
+    cache_file.write_text('cached')
+
+    def fail(schema):
+        raise AssertionError('facade rebuilt despite cache hit')
+
+    monkeypatch.setattr(facade, 'buildFacade', fail)
+    captures = facade.generate_facades({'latest': [schema]}, str(tmp_path))
+    assert str(captures[1]['TestFacade']) == 'cached'
+
+
+def test_generate_facades_unusable_cache(tmp_path):
+    cache_dir = tmp_path / 'not-a-dir'
+    cache_dir.write_text('')
+    captures = facade.generate_facades({'latest': [make_schema()]},
+                                       str(cache_dir))
+    assert 'async def Ping(self)' in str(captures[1]['TestFacade'])
+
+    captures = facade.generate_facades({'latest': [make_schema()]},
+                                       '/proc/nonexistent/cache')
+    assert 'async def Ping(self)' in str(captures[1]['TestFacade'])
+
+
+def test_generate_facades_prunes_stale_cache(tmp_path):
+    stale = tmp_path / 'facade-stale.py'
+    stale.write_text('stale')
+    other = tmp_path / 'other.py'
+    other.write_text('other')
+    facade.generate_facades({'latest': [make_schema()]}, str(tmp_path))
+    assert not stale.exists()
+    assert other.exists()
+    assert len(list(tmp_path.glob('facade-*.py'))) == 1
+
+
+def test_generator_digest_python_version(monkeypatch):
+    digest = facade.generator_digest()
+    monkeypatch.setattr(facade.sys, 'version', 'other')
+    assert facade.generator_digest() != digest
+
+
+@pytest.mark.asyncio
+async def test_watcher_rpc_sends_id():
+    class Connection:
+        async def rpc(self, msg, encoder=None):
+            return msg
+
+    class Watcher:
+        Id = 'watcher-id'
+        connection = Connection()
+
+    rpc, source = facade.makeRPCFunc(None)
+    assert "msg['Id'] = self.Id" in source
+    msg = await rpc(Watcher(), {'request': 'Next'})
+    assert msg == {'request': 'Next', 'Id': 'watcher-id'}
+
+
+def test_build_object_nested():
+    node = {
+        'type': 'object',
+        'properties': {
+            'b': {
+                'type': 'object',
+                'properties': {
+                    'z': {'type': 'string'},
+                    'y': {
+                        'type': 'object',
+                        'properties': {'q': {'type': 'integer'}},
+                        'patternProperties': {'.*': {
+                            'type': 'array',
+                            'items': {'type': 'array', 'items': {
+                                '$ref': '#/definitions/X'}},
+                        }},
+                    },
+                },
+                'additionalProperties': True,
+            },
+            'a': {'type': 'array', 'items': {'type': 'string'}},
+            'c': {'type': 'object', 'additionalProperties': True},
+            'd': {
+                'type': 'object',
+                'patternProperties': {'.*': {'$ref': '#/definitions/Y'}},
+                'additionalProperties': True,
+            },
+        },
+        'patternProperties': {'.*': {'type': 'string'}},
+    }
+    schema = facade.Schema({'Name': 'Test', 'Version': 1, 'Schema': {}})
+    result = [(name, str(type_)) for name, type_ in schema.buildObject(node, 'Top')]
+    assert result == [
+        ('a', 'typing.Sequence[str]'),
+        ('q', "<class 'int'>"),
+        ('y', 'typing.Mapping[str, typing.Sequence[~X]]'),
+        ('z', "<class 'str'>"),
+        ('c', 'typing.Any'),
+        ('d', 'typing.Mapping[str, ~Y]'),
+        ('Top', 'typing.Mapping[str, str]'),
+    ]